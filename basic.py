@@ -1,19 +1,115 @@
 import serial
+import select
 import time
 import struct
+from array import array
+import numpy as np
 from typing import List, Optional
 
+try:
+    # crcmod带C扩展，可整体替换纯Python逐字节循环
+    from crcmod.predefined import mkPredefinedCrcFun
+    _modbus_crc = mkPredefinedCrcFun('modbus')
+except ImportError:
+    _modbus_crc = None
+
+
+def _crc16_bits(crc: int, count: int, _P: int = 0xA001) -> int:
+    """逐位推进Modbus CRC16寄存器count位（无分支写法，用于生成查找表）"""
+    for _ in range(count):
+        crc = (crc >> 1) ^ (_P & -(crc & 1))
+    return crc
+
+
+# 16项表仅32字节，命令帧很短(≤8字节)，小表比256项表更省缓存
+_CRC16_NIB = array('H', (_crc16_bits(nibble, 4) for nibble in range(16)))
+
+
+def _build_crc16_slice_tables(count: int) -> List[array]:
+    """预计算slicing-by-N CRC16查找表，tables[k][i]为字节i之后再经过k个字节的CRC贡献"""
+    base = array('H', (_crc16_bits(byte, 8) for byte in range(256)))
+    tables = [base]
+    for _ in range(1, count):
+        prev = tables[-1]
+        tables.append(array('H', ((crc >> 8) ^ base[crc & 0xFF] for crc in prev)))
+    return tables
+
+
+# 数据长度达到该值时才使用分片算法，短命令帧仍用半字节表
+_CRC16_LONG_MIN_LEN = 32
+
+_CRC16_SB8 = _build_crc16_slice_tables(8)
+
+
+def _crc16_sb8(data) -> int:
+    """slicing-by-8 CRC16：每8字节做8次独立查表再异或，用于较长数据"""
+    t0, t1, t2, t3, t4, t5, t6, t7 = _CRC16_SB8
+    crc = 0xFFFF
+    tail = len(data) - len(data) % 8
+    for i in range(0, tail, 8):
+        crc = (t7[data[i] ^ (crc & 0xFF)] ^ t6[data[i + 1] ^ (crc >> 8)] ^
+               t5[data[i + 2]] ^ t4[data[i + 3]] ^ t3[data[i + 4]] ^
+               t2[data[i + 5]] ^ t1[data[i + 6]] ^ t0[data[i + 7]])
+    for byte in data[tail:]:
+        crc = (crc >> 8) ^ t0[(crc ^ byte) & 0xFF]
+    return crc
+
+
+# Numba编译的CRC内核，首次计算较长数据时才尝试导入，避免拖慢模块加载
+_crc16_sb4 = None
+_crc16_sb4_loaded = False
+
+
+def _load_crc16_sb4():
+    """按需导入Numba并编译slicing-by-4内核，Numba不可用时返回None"""
+    global _crc16_sb4, _crc16_sb4_loaded
+    if _crc16_sb4_loaded:
+        return _crc16_sb4
+    _crc16_sb4_loaded = True
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    table_sb4 = np.array(_CRC16_SB8[:4], dtype=np.uint16)
+
+    @njit(cache=True)
+    def crc16_sb4(buf):
+        """slicing-by-4 CRC16内核：每4字节做4次独立查表再异或"""
+        table = table_sb4
+        crc = np.int64(0xFFFF)
+        n = buf.shape[0]
+        i = 0
+        while i + 4 <= n:
+            crc = (np.int64(table[3, (np.int64(buf[i]) ^ crc) & 0xFF]) ^
+                   np.int64(table[2, (np.int64(buf[i + 1]) ^ (crc >> 8)) & 0xFF]) ^
+                   np.int64(table[1, buf[i + 2]]) ^
+                   np.int64(table[0, buf[i + 3]]))
+            i += 4
+        while i < n:
+            crc = (crc >> 8) ^ np.int64(table[0, (crc ^ np.int64(buf[i])) & 0xFF])
+            i += 1
+        return crc
+
+    _crc16_sb4 = crc16_sb4
+    return _crc16_sb4
+
 
 class GM8050Reader:
-    # 寄存器地址常量 (十六进制)
-    LASER_CTRL_REG = "0200"
-    DEMOD_CTRL_REG = "0201"
-    SINGLE_SCAN_REG = "0202"
-    CENTER_WL_FLOAT_BASE = "0300"  # 浮点数中心波长基地址
-    SPECTRUM_BASE = "2000"  # 光谱数据基地址
-
-    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1):
+    # 寄存器地址常量
+    LASER_CTRL_REG = 0x0200
+    DEMOD_CTRL_REG = 0x0201
+    SINGLE_SCAN_REG = 0x0202
+    CENTER_WL_FLOAT_BASE = 0x0300  # 浮点数中心波长基地址
+    SPECTRUM_BASE = 0x2000  # 光谱数据基地址
+    SPECTRUM_POINTS = 2051  # 协议规定每个通道2051个点
+    SCAN_WAIT = 1.0  # 单次扫描固定等待时间（秒）
+
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 1,
+                 poll_scan_status: bool = False):
         """初始化串口连接"""
+        # 协议未说明扫描完成状态，默认固定等待；确认设备扫描完成后清零单次扫描寄存器时才开启轮询
+        self.poll_scan_status = poll_scan_status
         self.ser = serial.Serial(
             port=port,
             baudrate=baudrate,  # 协议指定115200波特率
@@ -22,98 +118,197 @@ class GM8050Reader:
             stopbits=1,
             timeout=timeout
         )
+        # Linux下开启ASYNC_LOW_LATENCY，避免FTDI等USB串口默认16ms延迟定时器拖慢每次应答
+        try:
+            self.ser.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError):
+            pass  # 非Linux平台或驱动不支持时保持默认设置
+        # POSIX下用select等待串口可读，读取本身不阻塞，无需反复修改串口超时
+        try:
+            self._fd = self.ser.fileno()
+        except (AttributeError, OSError):
+            self._fd = None  # Windows串口没有可select的文件描述符
+        else:
+            self.ser.timeout = 0
         self.byte_array = bytearray()
         self.NUM_CHANNELS = 4  # 实际通道数设为4
+        self._rx_dirty = True  # 输入缓冲区可能残留上一帧数据
+        self._awaiting_response = False  # 已发送命令但尚未读取其应答
+        self._expect_trailer = True  # 调用方未计入帧尾CRC时是否尝试读走
+
+        # 预先构建固定命令帧，发送时无需重复计算CRC
+        self.CMD_START_DEMOD = self.build_command(0x01, 0x06, struct.pack('>HH', self.DEMOD_CTRL_REG, 0x0001))
+        self.CMD_STOP_DEMOD = self.build_command(0x01, 0x06, struct.pack('>HH', self.DEMOD_CTRL_REG, 0x0000))
+        self.CMD_SINGLE_SCAN = self.build_command(0x01, 0x06, struct.pack('>HH', self.SINGLE_SCAN_REG, 0x0001))
+        self.CMD_READ_SCAN_STATUS = self.build_command(0x01, 0x03, struct.pack('>HH', self.SINGLE_SCAN_REG, 1))
+        self.CMD_READ_SCAN_PARAMS = self.build_command(0x01, 0x03, struct.pack('>HH', 0x1005, 3))
+        self.CMD_READ_CENTER_WL = self.build_command(0x01, 0x14, struct.pack('>HH', self.CENTER_WL_FLOAT_BASE, 0x0200))
+        # 通道1-4光谱数据基地址依次为2000H、3000H、4000H、5000H
+        self.CMD_READ_SPECTRUM = tuple(
+            self.build_command(0x01, 0x14, struct.pack('>HH', self.SPECTRUM_BASE + 0x1000 * ch, self.SPECTRUM_POINTS))
+            for ch in range(4)
+        )
 
     def convert_bytes_to_float(self, byte_array):
         """将4字节大端序数据转换为浮点数"""
-        return struct.unpack('>f', byte_array)[0]
+        return struct.unpack_from('>f', byte_array)[0]
 
     def convert_bytes_to_uint16(self, byte_array):
         """将2字节数据转换为UINT16"""
-        return (byte_array[0] << 8) | byte_array[1]
+        return struct.unpack_from('>H', byte_array)[0]
 
     @staticmethod
     def calc_crc16(data: bytes) -> int:
         """计算Modbus CRC16校验码 (符合协议规范)"""
+        if _modbus_crc is not None:
+            return _modbus_crc(bytes(data))
+
+        if len(data) >= _CRC16_LONG_MIN_LEN:
+            kernel = _load_crc16_sb4()
+            if kernel is not None:
+                return int(kernel(np.frombuffer(bytes(data), dtype=np.uint8)))
+            return _crc16_sb8(data)
+
+        # 未安装crcmod时使用半字节查表实现
         crc = 0xFFFF
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
+            crc = (crc >> 4) ^ _CRC16_NIB[(crc ^ byte) & 0x0F]
+            crc = (crc >> 4) ^ _CRC16_NIB[(crc ^ (byte >> 4)) & 0x0F]
         return crc
 
-    def build_command(self, address: str, function: str, data: str = "") -> bytes:
+    def build_command(self, address: int, function: int, data: bytes = b"") -> bytes:
         """构建完整Modbus命令（带CRC校验）"""
-        cmd_hex = address + function + data
-        cmd_bytes = bytes.fromhex(cmd_hex)
-        crc = self.calc_crc16(cmd_bytes)
-        return cmd_bytes + bytes([crc & 0xFF, (crc >> 8) & 0xFF])
-
-    def send_command(self, address: str, function: str, data: str = "") -> bool:
+        # 地址(1)+功能码(1)+数据+CRC(2)，一次分配完成
+        buf = bytearray(4 + len(data))
+        buf[0] = address
+        buf[1] = function
+        buf[2:-2] = data
+        crc = self.calc_crc16(memoryview(buf)[:-2])
+        buf[-2] = crc & 0xFF
+        buf[-1] = (crc >> 8) & 0xFF
+        return bytes(buf)
+
+    def send_command(self, address: int, function: int, data: bytes = b"") -> bool:
         """发送Modbus命令"""
         try:
-            cmd = self.build_command(address, function, data)
+            return self.write_command(self.build_command(address, function, data))
+        except Exception as e:
+            print(f"发送错误: {e}")
+            return False
+
+    def write_command(self, cmd: bytes) -> bool:
+        """发送已构建好的Modbus命令帧"""
+        # 上一条命令的应答未被读取（如写寄存器的回显）时，其数据会残留在缓冲区
+        if self._awaiting_response:
+            self._rx_dirty = True
+        try:
+            # 发送前清空残留数据；发送后再清空可能丢掉设备已返回的应答
+            if self._rx_dirty:
+                self.ser.reset_input_buffer()
+                self._rx_dirty = False
+            self._awaiting_response = True
             self.ser.write(cmd)
             return True
         except Exception as e:
             print(f"发送错误: {e}")
             return False
 
+    @staticmethod
+    def _frame_length(header) -> int:
+        """根据响应帧头计算完整帧长度（含CRC），无法判断时返回0"""
+        function = header[1]
+        if function == 0x06:  # 写寄存器回显
+            return 8
+        if function in (0x03, 0x04):
+            return 3 + header[2] + 2
+        if function == 0x14 and len(header) >= 4:
+            return 4 + ((header[2] << 8) | header[3]) + 2
+        return 0
+
     def read_response(self, expected_len: int, timeout: float = 1.0) -> str:
         """读取并解析响应，优化超时处理"""
-        self.ser.reset_input_buffer()
-        self.byte_array = bytearray()
-        start_time = time.time()
-        last_data_time = start_time  # 记录最后一次收到数据的时间
-        min_data_length = 5  # 最小有效数据长度
-
-        while (time.time() - start_time) < timeout:
-            if self.ser.in_waiting:
-                self.byte_array.extend(self.ser.read(self.ser.in_waiting))
-                last_data_time = time.time()  # 更新最后收到数据的时间
-
-                # 检查基本错误
-                if len(self.byte_array) >= 3:
-                    if self.byte_array[1] & 0x80:  # 异常响应
-                        if len(self.byte_array) >= 5:
-                            error_code = self.byte_array[2]
-                            if error_code == 1:
-                                return "非法功能码"
-                            elif error_code == 2:
-                                return "非法数据地址"
-                            elif error_code == 3:
-                                return "非法数据值"
-                            else:
-                                return f"未知错误码: {error_code}"
-
-                # 检查是否收到足够数据
-                if len(self.byte_array) >= expected_len:
-                    return "成功"
-
-            # 快速判断：如果已经等待超过0.1秒且没有新数据，并且已有数据长度不足，则认为无数据
-            if (time.time() - last_data_time > 0.1) and len(self.byte_array) < min_data_length:
-                return "无数据"
-
+        # 整帧读完前标记缓冲区可能残留数据，下次发送命令前清空
+        self._rx_dirty = True
+        self._awaiting_response = False
+        deadline = time.monotonic() + timeout
+        header_len = min(expected_len, 5)  # 最小有效数据长度（异常响应帧长度）
+
+        # 预分配接收缓冲区，数据直接读入其中，避免逐块扩容
+        self.byte_array = bytearray(expected_len)
+        with memoryview(self.byte_array) as view:
+            # 先读取帧头：如果0.1秒内没有收到足够数据，则认为无数据
+            received = self._read_into(view, 0, header_len, min(deadline, time.monotonic() + 0.1))
+            if received == header_len and not self.byte_array[1] & 0x80:
+                received = self._read_into(view, received, expected_len, deadline)
+        del self.byte_array[received:]
+
+        if len(self.byte_array) < header_len:
+            return "无数据"
+
+        # 检查基本错误
+        if self.byte_array[1] & 0x80:  # 异常响应
+            error_code = self.byte_array[2]
+            if error_code == 1:
+                return "非法功能码"
+            elif error_code == 2:
+                return "非法数据地址"
+            elif error_code == 3:
+                return "非法数据值"
+            else:
+                return f"未知错误码: {error_code}"
+
+        # 检查是否收到足够数据
+        if len(self.byte_array) >= expected_len:
+            self._read_frame_trailer()
+            return "成功"
         return "响应超时"
 
+    def _read_into(self, view: memoryview, received: int, end: int, deadline: float) -> int:
+        """在截止时间前将数据读入view[received:end]，返回已接收的总字节数"""
+        while received < end:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._fd is not None:
+                # 由内核通知数据到达，等待期间不占用CPU
+                ready, _, _ = select.select([self._fd], [], [], remaining)
+                if not ready:
+                    break
+            else:
+                self.ser.timeout = remaining
+            received += self.ser.readinto(view[received:end])
+        return received
+
+    def _read_frame_trailer(self):
+        """读走调用方未计入的帧尾(CRC)，整帧读完时缓冲区无残留，下次无需清空"""
+        frame_len = self._frame_length(self.byte_array)
+        missing = frame_len - len(self.byte_array)
+        if missing > 0 and self._expect_trailer:
+            received = len(self.byte_array)
+            self.byte_array.extend(bytes(missing))
+            with memoryview(self.byte_array) as view:
+                received = self._read_into(view, received, frame_len, time.monotonic() + 0.02)
+            del self.byte_array[received:]
+            # 设备未发送帧尾时不再等待，改为下次通信前清空缓冲区
+            self._expect_trailer = len(self.byte_array) == frame_len
+        self._rx_dirty = len(self.byte_array) != frame_len
+
     def start_demodulation(self):
         """启动解调过程（符合协议启动顺序）"""
         # 由于只有4个通道，我们只需要启动地址01（通道1-8）即可
-        self.send_command("01", "06", f"{self.DEMOD_CTRL_REG}0001")
+        self.write_command(self.CMD_START_DEMOD)
         time.sleep(1)  # 等待扫描完成
 
-    def read_center_wavelengths(self, address: str) -> List[float]:
+    def read_center_wavelengths(self, address: int) -> List[float]:
         """读取单个通道的中心波长（浮点数）"""
-        # 使用功能码14H读取浮点数中心波长
-        cmd_data = f"03000200"  # 起始地址0300H，数量0200H(512个寄存器)
+        # 使用功能码14H读取浮点数中心波长，起始地址0300H，数量0200H(512个寄存器)
         results = []
 
-        if not self.send_command(address, "14", cmd_data):
+        if address == 0x01:
+            sent = self.write_command(self.CMD_READ_CENTER_WL)
+        else:
+            sent = self.send_command(address, 0x14, struct.pack('>HH', self.CENTER_WL_FLOAT_BASE, 0x0200))
+        if not sent:
             return results
 
         # 期待响应: 4字节头 + 1024字节数据
@@ -122,56 +317,56 @@ class GM8050Reader:
             print(f"读取中心波长失败: {resp_status}")
             return []
 
-        # 解析数据 (跳过4字节头)
-        data = self.byte_array[4:4 + 1024]
-
-        # 解析32个浮点数波长
-        for i in range(32):
-            idx = i * 4
-            # 大端序浮点数转换
-            value = struct.unpack('>f', data[idx:idx + 4])[0]
-            if value > 0:  # 过滤无效数据
-                results.append(value)
+        # 解析32个大端序浮点数波长 (跳过4字节头)
+        values = np.frombuffer(self.byte_array, dtype='>f4', count=32, offset=4)
+        results = values[values > 0].tolist()  # 过滤无效数据
 
         return results
 
     def start_spectrum_scan(self):
         """启动单次光谱扫描"""
-        self.send_command("01", "06", f"{self.SINGLE_SCAN_REG}0001")
-        time.sleep(1)  # 等待扫描完成
+        deadline = time.monotonic() + self.SCAN_WAIT
+        self.write_command(self.CMD_SINGLE_SCAN)
+        self.read_response(8, 0.1)  # 读走写寄存器回显
+        # 默认固定等待扫描完成；开启轮询且确认扫描完成时提前返回
+        if self.poll_scan_status and self._wait_scan_complete(deadline):
+            return
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _wait_scan_complete(self, deadline: float, poll_interval: float = 0.02) -> bool:
+        """轮询单次扫描寄存器（假定扫描完成后清零），在deadline前读到0时返回True"""
+        while True:
+            # 扫描期间降低查询频率，避免频繁打扰正在扫描的设备
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if not self.write_command(self.CMD_READ_SCAN_STATUS):
+                return False
+            # 期待响应: 3字节头 + 2字节数据 + 2字节CRC
+            if self.read_response(7, min(0.1, remaining)) != "成功" or self.byte_array[1] != 0x03:
+                return False  # 设备不支持查询扫描状态
+            if struct.unpack_from('>H', self.byte_array, 3)[0] == 0:
+                return True
 
     def read_scan_parameters(self) -> tuple:
         """读取设备内置的扫描参数（起点、终点、步长）"""
         try:
-            # 读取扫描起点 (1005H)
-            if not self.send_command("01", "03", "10050001"):
-                print("读取扫描起点失败")
-                return (0, 0, 0)
-            resp_status = self.read_response(7, 1.0)
-            if resp_status != "成功" or len(self.byte_array) < 7:
-                print(f"扫描起点响应失败: {resp_status}")
-                return (0, 0, 0)
-            start_reg = (self.byte_array[3] << 8) | self.byte_array[4]
-
-            # 读取扫描终点 (1006H)
-            if not self.send_command("01", "03", "10060001"):
-                print("读取扫描终点失败")
-                return (0, 0, 0)
-            resp_status = self.read_response(7, 1.0)
-            if resp_status != "成功" or len(self.byte_array) < 7:
-                print(f"扫描终点响应失败: {resp_status}")
+            # 一次读取起点、终点、步长三个连续寄存器 (1005H-1007H)
+            if not self.write_command(self.CMD_READ_SCAN_PARAMS):
+                print("读取扫描参数命令发送失败")
                 return (0, 0, 0)
-            stop_reg = (self.byte_array[3] << 8) | self.byte_array[4]
-
-            # 读取扫描步长 (1007H)
-            if not self.send_command("01", "03", "10070001"):
-                print("读取扫描步长失败")
-                return (0, 0, 0)
-            resp_status = self.read_response(7, 1.0)
-            if resp_status != "成功" or len(self.byte_array) < 7:
-                print(f"扫描步长响应失败: {resp_status}")
+            # 期待响应: 3字节头 + 6字节数据 + 2字节CRC
+            resp_status = self.read_response(11, 1.0)
+            if resp_status != "成功" or len(self.byte_array) < 11:
+                print(f"扫描参数响应失败: {resp_status}")
                 return (0, 0, 0)
-            step_reg = (self.byte_array[3] << 8) | self.byte_array[4]
+            start_reg, stop_reg, step_reg = struct.unpack_from('>HHH', self.byte_array, 3)
 
             # 转换为实际波长值 (根据协议 7000=1527nm, 48000=1568nm)
             start_wl = 1520 + start_reg / 1000.0
@@ -193,54 +388,46 @@ class GM8050Reader:
                 print("无效的扫描步长")
                 return [], []
 
-            # 计算数据点数 (协议规定每个通道2051个点)
-            num_points = 2051
-
-            # 通道基地址映射
-            channel_base_addrs = {
-                0: 0x2000,  # 通道1
-                1: 0x3000,  # 通道2
-                2: 0x4000,  # 通道3
-                3: 0x5000  # 通道4
-            }
+            num_points = self.SPECTRUM_POINTS
 
             # 生成波长数组
-            wavelengths = [start_wl + i * step_wl for i in range(num_points)]
+            wavelengths = start_wl + step_wl * np.arange(num_points, dtype=np.float64)
 
             # 读取每个通道的光谱数据
-            spectrum = []
+            # 各通道数据按行存放在一个连续数组中，读取失败的通道保持为0
+            spectrum = np.zeros((4, num_points), dtype=np.uint16)
+            channels_read = 0
+            # 预期响应长度：地址(1)+功能码(1)+字节数(2)+数据(2*num_points)
+            expected_length = 4 + 2 * num_points
+            requested = None  # 已提前发送读取请求的通道
             for ch_idx in range(4):
-                base_addr = channel_base_addrs[ch_idx]
-                cmd_start = f"{base_addr:04X}"
-                cmd_count = f"{num_points:04X}"
-                cmd = f"0114{cmd_start}{cmd_count}"
-
-                if not self.send_command(cmd[:2], cmd[2:4], cmd[4:]):
-                    print(f"通道{ch_idx + 1}光谱读取命令发送失败")
-                    spectrum.append([])
-                    continue
+                if requested != ch_idx:
+                    if not self.write_command(self.CMD_READ_SPECTRUM[ch_idx]):
+                        print(f"通道{ch_idx + 1}光谱读取命令发送失败")
+                        continue
 
-                # 预期响应长度：地址(1)+功能码(1)+字节数(2)+数据(2*num_points)
-                expected_length = 4 + 2 * num_points
                 resp_status = self.read_response(expected_length, timeout=1.0)
                 if resp_status != "成功":
                     print(f"通道{ch_idx + 1}光谱读取失败: {resp_status}")
-                    spectrum.append([])
                     continue
 
-                # 解析数据
-                data_bytes = self.byte_array[4:4 + 2 * num_points]
-                channel_data = []
-                for i in range(num_points):
-                    idx = i * 2
-                    if idx + 1 < len(data_bytes):
-                        value = (data_bytes[idx] << 8) | data_bytes[idx + 1]
-                        channel_data.append(value)
-                    else:
-                        channel_data.append(0)
-                spectrum.append(channel_data)
-                print(f"通道{ch_idx + 1}读取成功，获取{len(channel_data)}个数据点")
+                # 一次性校验字节数字段，保证数据区恰好为num_points个UINT16
+                if self.convert_bytes_to_uint16(self.byte_array[2:4]) != 2 * num_points:
+                    print(f"通道{ch_idx + 1}光谱数据长度异常")
+                    continue
+
+                # 本帧已完整读完时先发出下一通道的请求，解析与设备应答重叠进行
+                if ch_idx + 1 < 4 and not self._rx_dirty:
+                    if self.write_command(self.CMD_READ_SPECTRUM[ch_idx + 1]):
+                        requested = ch_idx + 1
 
+                # 解析数据 (大端序UINT16)
+                spectrum[ch_idx] = np.frombuffer(self.byte_array, dtype='>u2', count=num_points, offset=4)
+                channels_read += 1
+                print(f"通道{ch_idx + 1}读取成功，获取{num_points}个数据点")
+
+            if not channels_read:
+                return [], []
             return wavelengths, spectrum
         except Exception as e:
             print(f"读取光谱数据失败: {e}")
@@ -250,7 +437,7 @@ class GM8050Reader:
     def stop_demodulation(self):
         """停止解调"""
         # 只需要停止地址01（通道1-8）即可
-        self.send_command("01", "06", f"{self.DEMOD_CTRL_REG}0000")
+        self.write_command(self.CMD_STOP_DEMOD)
         time.sleep(0.5)
 
     def close(self):
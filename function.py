@@ -1,36 +1,75 @@
 import time
 import os
+import struct
+from collections import deque
+import numpy as np
 import serial.tools.list_ports
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt, QTimer, QThread, QObject, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QLabel, QLineEdit, QGroupBox, QGridLayout,
     QComboBox, QCheckBox, QSizePolicy, QFileDialog
 )
-import matplotlib.font_manager as fm
-from matplotlib.ticker import FormatStrFormatter
 
 from ui import GM8050ControlAppUI
 from basic import GM8050Reader
 
 
+class SpectrumWorker(QObject):
+    """在后台线程中执行光谱扫描与读取"""
+    dataReady = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, reader):
+        super().__init__()
+        self.reader = reader
+
+    @pyqtSlot()
+    def acquire(self):
+        """启动扫描并读取光谱数据"""
+        try:
+            self.reader.start_spectrum_scan()
+            wavelengths, spectrum = self.reader.read_spectrum()
+            self.dataReady.emit(wavelengths, spectrum)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
 class GM8050ControlApp(GM8050ControlAppUI):
+    acquire_requested = pyqtSignal()
+
+    REALTIME_MAX_FRAMES = 3600  # 实时数据最多保留的帧数
+
     def __init__(self):
         super().__init__()
         self.reader = None
+        # 日志消息先缓存，由定时器批量写入输出区域
+        self._log_queue = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
         self.refresh_ports()  # 初始刷新串口列表
         # 添加实时绘图定时器
         self.realtime_timer = QTimer()
         self.realtime_timer.timeout.connect(self.update_realtime_plot)
+        # 实时重绘定时器，两次重绘之间到达的数据只绘制最新一帧
+        self._pending_plot = None
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setInterval(50)
+        self._repaint_timer.timeout.connect(self._flush_plot_buffer)
         # 实时数据结构
         self.realtime_wavelengths = None  # 存储波长数据
-        self.realtime_data = {  # 存储各通道数据
-            0: [],  # 通道1
-            1: [],  # 通道2
-            2: [],  # 通道3
-            3: []  # 通道4
-        }
-        self.realtime_timestamps = []
+        self._rt_buf = None  # 各通道数据环形缓冲区 (4, 帧数, 波长点数)
+        self._rt_head = 0  # 已写入的总帧数
+        self.realtime_timestamps = deque(maxlen=self.REALTIME_MAX_FRAMES)
+        # 实时采集线程，仅在实时绘图期间存在
+        self._rt_thread = None
+        self._rt_worker = None
+        self._rt_busy = False  # 采集线程是否正在采集
+        # 当前绘制的数据，供鼠标悬停显示
+        self._plot_wavelengths = None
+        self._plot_spectrum = None
         # 连接信号
         self.refresh_btn.clicked.connect(self.refresh_ports)
         self.connect_btn.clicked.connect(self.connect_device)
@@ -68,23 +107,38 @@ class GM8050ControlApp(GM8050ControlAppUI):
         self.stop_demod_btn.setEnabled(enabled)
         self.read_spectrum_btn.setEnabled(enabled)
         self.save_data_btn.setEnabled(enabled)
-        self.ch1_check.setEnabled(enabled)
-        self.ch2_check.setEnabled(enabled)
-        self.ch3_check.setEnabled(enabled)
-        self.ch4_check.setEnabled(enabled)
+        for cb in self._channel_checks:
+            cb.setEnabled(enabled)
         self.start_realtime_btn.setEnabled(enabled)
         self.stop_realtime_btn.setEnabled(enabled and self.realtime_timer.isActive())
-        self.save_realtime_btn.setEnabled(enabled and self.realtime_data_count > 0)
+        self.save_realtime_btn.setEnabled(enabled and self._rt_head > 0)
+
+    def _selected_channels(self):
+        """返回选中通道的索引列表"""
+        # 尚未合并发出的复选框切换先行生效
+        if self._mask_emit_pending:
+            self._emit_mask()
+        return np.flatnonzero(self.ch_mask).tolist()
 
     def log_message(self, message):
         """在输出区域记录消息"""
-        self.output_text.append(message)
+        self._log_queue.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        """将缓存的日志一次性写入输出区域"""
+        if not self._log_queue:
+            return
+        self.output_text.appendPlainText("\n".join(self._log_queue))
         self.output_text.ensureCursorVisible()
         # 更新状态栏
-        self.statusBar().showMessage(message)
+        self.statusBar().showMessage(self._log_queue[-1])
+        self._log_queue.clear()
 
     def clear_output(self):
         """清空输出区域"""
+        self._log_queue.clear()
         self.output_text.clear()
         self.statusBar().showMessage("输出已清空")
 
@@ -96,10 +150,9 @@ class GM8050ControlApp(GM8050ControlAppUI):
                 self.log_message("错误: 请选择串口")
                 return
 
-            baudrate = int(self.baudrate_edit.text().strip())
+            baudrate = self._baudrate
 
             self.log_message(f"正在连接串口 {port}，波特率 {baudrate}...")
-            QApplication.processEvents()  # 更新UI
 
             self.reader = GM8050Reader(port, baudrate)
             self.log_message("设备连接成功!")
@@ -117,6 +170,9 @@ class GM8050ControlApp(GM8050ControlAppUI):
         """断开设备连接"""
         if self.realtime_timer.isActive():
             self.realtime_timer.stop()
+        self._stop_realtime_worker()
+        self._repaint_timer.stop()
+        self._pending_plot = None
 
         if self.reader:
             try:
@@ -141,16 +197,17 @@ class GM8050ControlApp(GM8050ControlAppUI):
 
         try:
             # 构建激光开启命令
-            address = "01"  # 固定地址01
-            function = "06"  # 功能码06H - 写寄存器
+            address = 0x01  # 固定地址01
+            function = 0x06  # 功能码06H - 写寄存器
             register = self.reader.LASER_CTRL_REG  # 0200H - 激光控制寄存器
-            data = "0001"  # 开启激光
+            data = 0x0001  # 开启激光
 
             # 发送命令
             self.log_message("发送激光开启命令...")
-            success = self.reader.send_command(address, function, register + data)
+            success = self.reader.send_command(address, function, struct.pack('>HH', register, data))
 
             if success:
+                self.reader.read_response(8, 0.1)  # 读走写寄存器回显，紧接着的状态查询不会读到它
                 self.log_message("激光开启命令发送成功!")
                 self.laser_status_label.setText("状态: 已开启")
                 # 读取状态确认
@@ -169,16 +226,17 @@ class GM8050ControlApp(GM8050ControlAppUI):
 
         try:
             # 构建激光关闭命令
-            address = "01"  # 固定地址01
-            function = "06"  # 功能码06H - 写寄存器
+            address = 0x01  # 固定地址01
+            function = 0x06  # 功能码06H - 写寄存器
             register = self.reader.LASER_CTRL_REG  # 0200H - 激光控制寄存器
-            data = "0000"  # 关闭激光
+            data = 0x0000  # 关闭激光
 
             # 发送命令
             self.log_message("发送激光关闭命令...")
-            success = self.reader.send_command(address, function, register + data)
+            success = self.reader.send_command(address, function, struct.pack('>HH', register, data))
 
             if success:
+                self.reader.read_response(8, 0.1)  # 读走写寄存器回显，紧接着的状态查询不会读到它
                 self.log_message("激光关闭命令发送成功!")
                 self.laser_status_label.setText("状态: 已关闭")
                 # 读取状态确认
@@ -193,21 +251,21 @@ class GM8050ControlApp(GM8050ControlAppUI):
         """检查激光状态 (可选)"""
         try:
             # 构建状态读取命令
-            address = "01"  # 固定地址01
-            function = "03"  # 功能码03H - 读寄存器
+            address = 0x01  # 固定地址01
+            function = 0x03  # 功能码03H - 读寄存器
             register = self.reader.LASER_CTRL_REG  # 0200H - 激光控制寄存器
-            count = "0001"  # 读取1个寄存器
+            count = 0x0001  # 读取1个寄存器
 
             # 发送命令
             self.log_message("读取激光状态...")
-            success = self.reader.send_command(address, function, register + count)
+            success = self.reader.send_command(address, function, struct.pack('>HH', register, count))
 
             if success:
                 # 期待响应: 5字节头 + 2字节数据
                 resp_status = self.reader.read_response(7, 1.0)
                 if resp_status == "成功" and len(self.reader.byte_array) >= 7:
                     # 解析状态值 (第5-6字节)
-                    status_value = (self.reader.byte_array[4] << 8) | self.reader.byte_array[5]
+                    status_value = struct.unpack_from('>H', self.reader.byte_array, 4)[0]
                     status = "开启" if status_value == 1 else "关闭"
                     self.log_message(f"激光状态: {status}")
                     self.laser_status_label.setText(f"状态: {status} (已确认)")
@@ -228,7 +286,7 @@ class GM8050ControlApp(GM8050ControlAppUI):
 
             self.log_message("启动解调过程...")
             # 根据VB示例，启动解调顺序
-            self.reader.send_command("01", "06", "02010001")  # 启动通道1-8
+            self.reader.write_command(self.reader.CMD_START_DEMOD)  # 启动通道1-8
             self.log_message("解调已成功启动")
         except Exception as e:
             self.log_message(f"启动解调失败: {str(e)}")
@@ -237,7 +295,7 @@ class GM8050ControlApp(GM8050ControlAppUI):
         """停止解调过程"""
         try:
             self.log_message("停止解调过程...")
-            self.reader.send_command("01", "06", "02010000")  # 停止解调
+            self.reader.write_command(self.reader.CMD_STOP_DEMOD)  # 停止解调
             self.log_message("解调已成功停止")
         except Exception as e:
             self.log_message(f"停止解调失败: {str(e)}")
@@ -251,7 +309,7 @@ class GM8050ControlApp(GM8050ControlAppUI):
                 self.log_message("警告: 激光器可能未开启，扫描可能失败!")
 
             self.log_message("启动光谱扫描...")
-            self.reader.send_command("01", "06", "02020001")  # 启动一次扫描
+            self.reader.write_command(self.reader.CMD_SINGLE_SCAN)  # 启动一次扫描
             self.log_message("光谱扫描已启动，等待1秒...")
         except Exception as e:
             self.log_message(f"启动光谱扫描失败: {str(e)}")
@@ -261,26 +319,47 @@ class GM8050ControlApp(GM8050ControlAppUI):
         try:
             # 启动扫描
             self.log_message("启动光谱扫描...")
-            self.reader.send_command("01", "06", "02020001")
-            time.sleep(0.9)
+            self.reader.start_spectrum_scan()
 
             # 读取设备内置光谱数据
             wavelengths, spectrum = self.reader.read_spectrum()
-            if not wavelengths or not any(spectrum):
+            return self.process_spectrum_data(wavelengths, spectrum)
+        except Exception as e:
+            self.log_message(f"读取失败: {str(e)}")
+            return [], []
+
+    def process_spectrum_data(self, wavelengths, spectrum):
+        """按用户设置筛选光谱数据并绘图"""
+        filtered_wavelengths, filtered_spectrum = self.filter_spectrum_data(wavelengths, spectrum)
+        if np.size(filtered_wavelengths) == 0:
+            return [], []
+
+        # 保存并绘图
+        self.last_wavelengths = filtered_wavelengths
+        self.last_spectrum = filtered_spectrum
+        self.plot_spectrum(filtered_wavelengths, filtered_spectrum)
+
+        self.log_message(f"成功获取光谱数据: {len(filtered_wavelengths)}个点")
+
+        # +++ 新增：计算并显示中心波长 +++
+        self.calculate_center_wavelengths(filtered_wavelengths, filtered_spectrum)
+
+        return filtered_wavelengths, filtered_spectrum
+
+    def filter_spectrum_data(self, wavelengths, spectrum):
+        """按用户设置的波长范围和步长筛选光谱数据"""
+        try:
+            if len(wavelengths) == 0:
                 self.log_message("错误: 未获取到光谱数据")
                 return [], []
 
-            # 获取用户设置
-            try:
-                user_start = float(self.start_wl_edit.text())
-                user_stop = float(self.stop_wl_edit.text())
-                user_step = float(self.step_edit.text())
-            except ValueError:
-                self.log_message("错误: 无效的波长设置")
-                return [], []
+            # 获取用户设置（输入完成时已缓存）
+            user_start = self._start_wl
+            user_stop = self._stop_wl
+            user_step = self._step
 
             # 获取设备步长
-            device_step = wavelengths[1] - wavelengths[0] if len(wavelengths) > 1 else 0
+            device_step = float(wavelengths[1] - wavelengths[0]) if len(wavelengths) > 1 else 0
 
             # 验证用户步长是设备步长的整数倍
             if device_step > 0:
@@ -290,43 +369,22 @@ class GM8050ControlApp(GM8050ControlAppUI):
                     self.log_message(
                         f"警告: 用户步长({user_step})不是设备步长({device_step:.4f})的整数倍，已自动调整为{adjusted_step:.4f}")
                     user_step = adjusted_step
+                    self._step = user_step
                     self.step_edit.setText(f"{user_step:.4f}")
 
-            # 筛选数据点
-            filtered_wavelengths = []
-            filtered_spectrum = [[] for _ in range(4)]
-
             # 计算步长倍数
             step_multiplier = max(1, round(user_step / device_step)) if device_step > 0 else 1
 
-            for i, wl in enumerate(wavelengths):
-                # 检查波长是否在用户设定范围内
-                if wl < user_start or wl > user_stop:
-                    continue
-
-                # 按步长倍数采样
-                if i % step_multiplier == 0:
-                    filtered_wavelengths.append(wl)
-                    for ch in range(4):
-                        if i < len(spectrum[ch]):
-                            filtered_spectrum[ch].append(spectrum[ch][i])
-                        else:
-                            filtered_spectrum[ch].append(0)
-
-            if not filtered_wavelengths:
+            # 按步长倍数采样，再筛选用户设定范围内的数据点
+            sampled_wl = wavelengths[::step_multiplier]
+            mask = (sampled_wl >= user_start) & (sampled_wl <= user_stop)
+            filtered_wavelengths = sampled_wl[mask]
+            filtered_spectrum = spectrum[:, ::step_multiplier][:, mask]
+
+            if filtered_wavelengths.size == 0:
                 self.log_message("错误: 没有在设定波长范围内的数据")
                 return [], []
 
-            # 保存并绘图
-            self.last_wavelengths = filtered_wavelengths
-            self.last_spectrum = filtered_spectrum
-            self.plot_spectrum(filtered_wavelengths, filtered_spectrum)
-
-            self.log_message(f"成功获取光谱数据: {len(filtered_wavelengths)}个点")
-
-            # +++ 新增：计算并显示中心波长 +++
-            self.calculate_center_wavelengths(filtered_wavelengths, filtered_spectrum)
-
             return filtered_wavelengths, filtered_spectrum
         except Exception as e:
             self.log_message(f"读取失败: {str(e)}")
@@ -334,103 +392,45 @@ class GM8050ControlApp(GM8050ControlAppUI):
 
     def plot_spectrum(self, wavelengths, spectrum):
         """绘制光谱数据"""
-        # 清除之前的图形
-        self.ax.clear()
-
-        # 设置中文字体
-        font_path = fm.findfont(fm.FontProperties(family='SimHei'))
-        font_prop = fm.FontProperties(fname=font_path)
-
-        # 设置标题和坐标轴标签
-        self.ax.set_title('光谱扫描结果', fontproperties=font_prop)
-        self.ax.set_xlabel('波长 (nm)', fontproperties=font_prop)
-        self.ax.set_ylabel('幅值', fontproperties=font_prop)
-        self.ax.grid(True)
-
-        # 定义不同通道的颜色
-        colors = ['b', 'g', 'r', 'c']
-        labels = ['通道 1', '通道 2', '通道 3', '通道 4']
-
-        # 根据复选框状态绘制数据
-        for i in range(min(4, len(spectrum))):
-            if i == 0 and self.ch1_check.isChecked():
-                self.ax.plot(wavelengths, spectrum[i], colors[i], label=labels[i])
-            elif i == 1 and self.ch2_check.isChecked():
-                self.ax.plot(wavelengths, spectrum[i], colors[i], label=labels[i])
-            elif i == 2 and self.ch3_check.isChecked():
-                self.ax.plot(wavelengths, spectrum[i], colors[i], label=labels[i])
-            elif i == 3 and self.ch4_check.isChecked():
-                self.ax.plot(wavelengths, spectrum[i], colors[i], label=labels[i])
-
-        # 添加图例
-        self.ax.legend(prop=font_prop)
-
-        # 自动调整坐标轴范围
-        self.ax.relim()
-        self.ax.autoscale_view()
-
-        # 添加鼠标悬停事件
-        self.canvas.mpl_connect('motion_notify_event', lambda event: self.on_mouse_move(event, wavelengths, spectrum))
-
-        # 重绘画布
-        self.canvas.draw()
+        # 根据复选框状态更新各通道曲线
+        selected = [ch for ch in self._selected_channels() if ch < len(spectrum)]
+        self.update_lines(wavelengths, spectrum, selected)
+
+        # 记录当前数据供鼠标悬停显示
+        self._plot_wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        self._plot_spectrum = spectrum
 
         self.log_message("光谱数据绘制完成")
 
     def calculate_center_wavelengths(self, wavelengths, spectrum):
         """计算各通道的中心波长（取幅值高于阈值点的加权平均值）"""
-        # 幅值阈值（可调整）
-        THRESHOLD_RATIO = 100
+        # 幅值阈值比例（相对峰值，可调整）
+        THRESHOLD_RATIO = 0.01
+
+        wl = np.asarray(wavelengths, dtype=np.float64)
 
         # 存储各通道的中心波长
         center_wavelengths = []
 
-        # 遍历每个通道
-        for ch in range(4):
-            # 只处理被选中的通道
-            if ((ch == 0 and self.ch1_check.isChecked()) or
-                    (ch == 1 and self.ch2_check.isChecked()) or
-                    (ch == 2 and self.ch3_check.isChecked()) or
-                    (ch == 3 and self.ch4_check.isChecked())):
-
-                # 获取当前通道数据
-                ch_data = spectrum[ch]
-                if not ch_data:
-                    continue
-
-                # 找到峰值点索引和最大幅值
-                max_value = max(ch_data)
-                max_idx = ch_data.index(max_value)
-
-                # 计算阈值
-                threshold = THRESHOLD_RATIO * max_value
-
-                # 收集高于阈值的点
-                high_value_points = []
-                for i, value in enumerate(ch_data):
-                    if value >= threshold:
-                        # 存储波长和对应的幅值
-                        high_value_points.append((wavelengths[i], value))
-
-                # 如果没有符合条件的点，使用峰值点
-                if not high_value_points:
-                    center_wl = wavelengths[max_idx]
-                    center_wavelengths.append((ch, center_wl))
-                    continue
-
-                # 计算加权平均中心波长
-                total_weight = 0.0
-                weighted_sum = 0.0
-
-                for wl, value in high_value_points:
-                    # 使用幅值的平方作为权重（更强调高幅值点）
-                    weight = value ** 2
-                    weighted_sum += wl * weight
-                    total_weight += weight
-
-                # 计算中心波长
-                center_wl = weighted_sum / total_weight if total_weight > 0 else wavelengths[max_idx]
-                center_wavelengths.append((ch, center_wl))
+        # 遍历被选中的通道
+        for ch in self._selected_channels():
+            # 获取当前通道数据
+            arr = np.asarray(spectrum[ch], dtype=np.float64)
+            if arr.size == 0:
+                continue
+
+            # 找到峰值点索引和最大幅值
+            max_idx = int(arr.argmax())
+            max_value = arr[max_idx]
+
+            # 高于阈值的点，以幅值的平方作为权重（更强调高幅值点）
+            mask = arr >= THRESHOLD_RATIO * max_value
+            w = arr[mask] ** 2
+            total_weight = w.sum()
+
+            # 计算中心波长，无有效权重时使用峰值点
+            center_wl = (wl[mask] * w).sum() / total_weight if total_weight > 0 else wl[max_idx]
+            center_wavelengths.append((ch, float(center_wl)))
 
         # 显示结果
         if center_wavelengths:
@@ -441,27 +441,35 @@ class GM8050ControlApp(GM8050ControlAppUI):
         else:
             self.log_message("未找到有效的中心波长数据")
 
-    def on_mouse_move(self, event, wavelengths, spectrum):
+    def _build_plot(self):
+        """创建绘图区后连接鼠标悬停事件"""
+        if not super()._build_plot():
+            return False
+        self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move)
+        return True
+
+    def on_mouse_move(self, event):
         """鼠标移动时显示当前点的数据"""
-        if not event.inaxes:
+        if not event.inaxes or self._plot_wavelengths is None:
             return
+        wavelengths = self._plot_wavelengths
+        spectrum = self._plot_spectrum
 
         # 获取鼠标位置
         x = event.xdata
         y = event.ydata
 
-        # 找到最近的波长点
-        if wavelengths:
-            idx = min(range(len(wavelengths)), key=lambda i: abs(wavelengths[i] - x))
+        # 二分查找最近的波长点（波长升序排列）
+        n = len(wavelengths)
+        if n:
+            idx = int(np.searchsorted(wavelengths, x))
+            if idx == n or (idx > 0 and x - wavelengths[idx - 1] <= wavelengths[idx] - x):
+                idx -= 1
             wl = wavelengths[idx]
+            self.update_cursor(wl)
 
-            # 获取所有通道在该波长的幅值
-            values = []
-            for i in range(4):
-                if idx < len(spectrum[i]):
-                    values.append(f"{spectrum[i][idx]}")
-                else:
-                    values.append("N/A")
+            # 获取所有通道在该波长的幅值（各通道点数与波长一致）
+            values = [f"{ch_data[idx]}" for ch_data in spectrum]
 
             # 更新状态栏
             self.statusBar().showMessage(
@@ -473,7 +481,7 @@ class GM8050ControlApp(GM8050ControlAppUI):
             )
 
     def save_spectrum_data(self):
-        """保存光谱数据到CSV文件"""
+        """保存光谱数据到NPZ或CSV文件"""
         try:
             # 检查是否有可用数据
             if not hasattr(self, 'last_wavelengths') or not hasattr(self, 'last_spectrum'):
@@ -484,47 +492,40 @@ class GM8050ControlApp(GM8050ControlAppUI):
             spectrum = self.last_spectrum
 
             # 检查数据有效性
-            if not wavelengths or not any(spectrum):
+            if np.size(wavelengths) == 0 or np.size(spectrum) == 0:
                 self.log_message("错误: 数据为空")
                 return
 
-            # 弹出文件保存对话框
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "保存光谱数据", "", "CSV文件 (*.csv);;所有文件 (*)"
+            # 弹出文件保存对话框，默认保存为压缩的NPZ文件
+            file_path, selected_filter = QFileDialog.getSaveFileName(
+                self, "保存光谱数据", "", "NPZ文件 (*.npz);;CSV文件 (*.csv)"
             )
 
             if not file_path:
                 return  # 用户取消
 
-            # 确保文件扩展名正确
-            if not file_path.lower().endswith('.csv'):
-                file_path += '.csv'
-
-            # 写入CSV文件
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                # 写入表头
-                f.write("波长(nm)")
-                for i in range(4):
-                    if (i == 0 and self.ch1_check.isChecked()) or \
-                            (i == 1 and self.ch2_check.isChecked()) or \
-                            (i == 2 and self.ch3_check.isChecked()) or \
-                            (i == 3 and self.ch4_check.isChecked()):
-                        f.write(f",通道{i + 1}")
-                f.write("\n")
+            # 未填写有效扩展名时按所选文件类型补全
+            ext = os.path.splitext(file_path)[1].lower()
+            if ext not in ('.npz', '.csv'):
+                ext = '.csv' if '*.csv' in selected_filter else '.npz'
+                file_path += ext
 
-                # 写入数据
-                for i in range(len(wavelengths)):
-                    f.write(f"{wavelengths[i]:.4f}")
-                    for ch in range(4):
-                        if (ch == 0 and self.ch1_check.isChecked()) or \
-                                (ch == 1 and self.ch2_check.isChecked()) or \
-                                (ch == 2 and self.ch3_check.isChecked()) or \
-                                (ch == 3 and self.ch4_check.isChecked()):
-                            if i < len(spectrum[ch]):
-                                f.write(f",{spectrum[ch][i]}")
-                            else:
-                                f.write(",")  # 空值
-                    f.write("\n")
+            # 选中的通道
+            selected = self._selected_channels()
+
+            # NPZ直接保存二进制数组，无需逐行格式化文本
+            if ext == '.npz':
+                np.savez_compressed(file_path, wl=wavelengths, data=spectrum[selected],
+                                    channels=np.asarray(selected) + 1)
+            else:
+                # 组装数据表: 波长列 + 各选中通道列
+                table = np.column_stack([wavelengths] + [spectrum[ch] for ch in selected])
+                header = "波长(nm)" + "".join(f",通道{ch + 1}" for ch in selected)
+
+                # 写入CSV文件
+                with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                    np.savetxt(f, table, fmt=['%.4f'] + ['%d'] * len(selected),
+                               delimiter=',', header=header, comments='')
 
             self.log_message(f"光谱数据已保存到: {file_path}")
 
@@ -535,95 +536,168 @@ class GM8050ControlApp(GM8050ControlAppUI):
 
     def start_realtime_plotting(self):
         """开始实时绘图"""
-        try:
-            # 获取更新间隔
-            interval = float(self.interval_edit.text().strip())
-            if interval < 1.0:
-                interval = 1.0
-                self.interval_edit.setText("1.0")
-
-            # 重置实时数据结构
-            self.realtime_wavelengths = None
-            self.realtime_data = {0: [], 1: [], 2: [], 3: []}
-            self.realtime_timestamps = []
-            self.last_update_time = 0  # 添加最后更新时间记录
-
-            # 设置定时器
-            self.realtime_timer.start(int(interval * 1000))
-            self.log_message(f"开始实时绘图，间隔 {interval} 秒")
-
-            # 更新按钮状态
-            self.start_realtime_btn.setEnabled(False)
-            self.stop_realtime_btn.setEnabled(True)
-            self.save_realtime_btn.setEnabled(False)
-
-        except ValueError:
-            self.log_message("错误: 更新间隔必须是数字")
+        # 获取更新间隔（校验器保证不小于1秒）
+        interval = self._interval
+
+        # 重置实时数据结构
+        self.realtime_wavelengths = None
+        self._rt_buf = None
+        self._rt_head = 0
+        self.realtime_timestamps.clear()
+        self.last_update_time = 0  # 添加最后更新时间记录
+
+        # 启动采集线程
+        self._rt_busy = False
+        self._rt_thread = QThread()
+        self._rt_worker = SpectrumWorker(self.reader)
+        self._rt_worker.moveToThread(self._rt_thread)
+        # 跨线程信号显式使用队列连接
+        self.acquire_requested.connect(self._rt_worker.acquire, Qt.QueuedConnection)
+        self._rt_worker.dataReady.connect(self._on_realtime_data, Qt.QueuedConnection)
+        self._rt_worker.failed.connect(self._on_realtime_failed, Qt.QueuedConnection)
+        self._rt_thread.start()
+
+        # 设置定时器
+        self.realtime_timer.start(int(interval * 1000))
+        self._pending_plot = None
+        self._repaint_timer.start()
+        self.log_message(f"开始实时绘图，间隔 {interval} 秒")
+
+        # 更新按钮状态，采集线程占用串口期间禁用其他串口操作
+        self.start_realtime_btn.setEnabled(False)
+        self.stop_realtime_btn.setEnabled(True)
+        self.save_realtime_btn.setEnabled(False)
+        self._set_serial_buttons_enabled(False)
 
     def stop_realtime_plotting(self):
         """停止实时绘图"""
         self.realtime_timer.stop()
+        self._stop_realtime_worker()
+        self._repaint_timer.stop()
+        self._flush_plot_buffer()
         self.log_message("已停止实时绘图")
         self.start_realtime_btn.setEnabled(True)
         self.stop_realtime_btn.setEnabled(False)
+        self._set_serial_buttons_enabled(True)
 
         # 如果有数据，则允许保存
-        if any(len(data) > 0 for data in self.realtime_data.values()):
+        if self._rt_head > 0:
             self.save_realtime_btn.setEnabled(True)
 
+    def _flush_plot_buffer(self):
+        """绘制最新到达的实时数据"""
+        if self._pending_plot is None:
+            return
+        wavelengths, spectrum = self._pending_plot
+        self._pending_plot = None
+        self.plot_spectrum(wavelengths, spectrum)
+
+    def _set_serial_buttons_enabled(self, enabled):
+        """启用或禁用会访问串口的手动操作按钮"""
+        self.laser_on_btn.setEnabled(enabled)
+        self.laser_off_btn.setEnabled(enabled)
+        self.start_demod_btn.setEnabled(enabled)
+        self.stop_demod_btn.setEnabled(enabled)
+        self.read_spectrum_btn.setEnabled(enabled)
+
+    def _stop_realtime_worker(self):
+        """停止采集线程，等待当前采集完成"""
+        if self._rt_thread is None:
+            return
+        self.acquire_requested.disconnect(self._rt_worker.acquire)
+        self._rt_thread.quit()
+        self._rt_thread.wait()
+        self._rt_worker = None
+        self._rt_thread = None
+        self._rt_busy = False
+
     def update_realtime_plot(self):
-        """更新实时光谱图"""
+        """定时请求采集线程读取光谱"""
         if not self.reader:
             self.stop_realtime_plotting()
             return
 
+        # 上一次采集尚未完成时不再请求
+        if self._rt_busy:
+            return
+
         # 检查是否达到间隔时间
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_update_time < 1.0:  # 确保至少1秒间隔
             return
 
-        try:
-            # 记录开始时间
-            start_time = time.time()
+        # 记录开始时间
+        self._rt_start_time = time.monotonic()
+        self.log_message("启动光谱扫描...")
+        self._rt_busy = True
+        self.acquire_requested.emit()
+
+    @pyqtSlot(str)
+    def _on_realtime_failed(self, message):
+        """采集线程读取失败"""
+        self._rt_busy = False
+        self.log_message(f"实时更新失败: {message}")
+
+    @pyqtSlot(object, object)
+    def _on_realtime_data(self, wavelengths, spectrum):
+        """采集线程返回数据后更新实时光谱图"""
+        self._rt_busy = False
+        if not self.realtime_timer.isActive():
+            return
 
-            # 读取光谱数据
-            wavelengths, spectrum = self.read_spectrum_data()
-            if wavelengths and any(spectrum):
+        try:
+            start_time = self._rt_start_time
+
+            # 筛选光谱数据
+            wavelengths, spectrum = self.filter_spectrum_data(wavelengths, spectrum)
+            if np.size(wavelengths) > 0 and np.size(spectrum) > 0:
+                # 保存最新一帧，供手动保存使用
+                self.last_wavelengths = wavelengths
+                self.last_spectrum = spectrum
                 current_time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
 
                 # 更新数据结构
                 if self.realtime_wavelengths is None:
                     self.realtime_wavelengths = wavelengths
+                    self._rt_buf = np.zeros((4, self.REALTIME_MAX_FRAMES, len(wavelengths)), dtype=np.float32)
+
+                # 缓冲区首次写满时提示，此后覆盖最早的数据
+                if self._rt_head == self.REALTIME_MAX_FRAMES:
+                    self.log_message(
+                        f"实时数据已达到{self.REALTIME_MAX_FRAMES}组上限，之后将覆盖最早的数据")
 
-                # 存储各通道数据
-                for ch in range(4):
-                    if ((ch == 0 and self.ch1_check.isChecked()) or
-                            (ch == 1 and self.ch2_check.isChecked()) or
-                            (ch == 2 and self.ch3_check.isChecked()) or
-                            (ch == 3 and self.ch4_check.isChecked())):
-                        self.realtime_data[ch].append(spectrum[ch])
+                # 存储各通道数据，点数不一致时截断或补0
+                frame = self._rt_buf[:, self._rt_head % self.REALTIME_MAX_FRAMES]
+                n = min(len(wavelengths), frame.shape[1])
+                frame[:, :n] = spectrum[:, :n]
+                frame[:, n:] = 0
+                self._rt_head += 1
 
                 # 存储时间戳
                 self.realtime_timestamps.append(current_time_str)
 
-                # 更新图表
-                self.plot_spectrum(wavelengths, spectrum)
+                # 交给重绘定时器更新图表
+                self._pending_plot = (wavelengths, spectrum)
                 self.statusBar().showMessage(
                     f"最后更新时间: {current_time_str} (数据组数: {len(self.realtime_timestamps)})")
 
+                # 计算并显示中心波长
+                self.calculate_center_wavelengths(wavelengths, spectrum)
+
                 # 更新最后更新时间
-                self.last_update_time = time.time()
+                self.last_update_time = time.monotonic()
 
-                # 计算实际耗时并记录
-                elapsed = time.time() - start_time
-                self.log_message(f"数据采集耗时: {elapsed:.2f}秒")
+                # 计算实际耗时，超过更新间隔时才记录
+                elapsed = time.monotonic() - start_time
+                if elapsed > self.realtime_timer.interval() / 1000:
+                    self.log_message(f"数据采集耗时: {elapsed:.2f}秒")
 
         except Exception as e:
             self.log_message(f"实时更新失败: {str(e)}")
 
     def save_realtime_data(self):
         """保存实时数据到文件（每个通道单独保存）"""
-        if not any(len(data) > 0 for data in self.realtime_data.values()):
+        if self._rt_head == 0:
             self.log_message("没有可保存的实时数据")
             return
 
@@ -641,40 +715,28 @@ class GM8050ControlApp(GM8050ControlAppUI):
                 self.log_message("错误: 没有可用的波长数据")
                 return
 
-            # 保存每个通道的数据
-            for ch in range(4):
-                # 只保存用户选择的通道
-                if ((ch == 0 and self.ch1_check.isChecked()) or
-                    (ch == 1 and self.ch2_check.isChecked()) or
-                    (ch == 2 and self.ch3_check.isChecked()) or
-                    (ch == 3 and self.ch4_check.isChecked())) and \
-                        len(self.realtime_data[ch]) > 0:
-
-                    # 创建通道文件名
-                    filename = f"channel_{ch + 1}_{timestamp}.csv"
-                    file_path = os.path.join(folder_path, filename)
-
-                    # 写入数据
-                    with open(file_path, 'w', encoding='utf-8-sig') as f:
-                        # 写入表头
-                        f.write("波长(nm)")
-                        for ts in self.realtime_timestamps:
-                            f.write(f",{ts}")
-                        f.write("\n")
-
-                        # 写入数据行 - 按波长点组织
-                        for i, wl in enumerate(self.realtime_wavelengths):
-                            f.write(f"{wl:.4f}")
-                            # 遍历所有时间点
-                            for j in range(len(self.realtime_timestamps)):
-                                # 确保索引在范围内
-                                if j < len(self.realtime_data[ch]) and i < len(self.realtime_data[ch][j]):
-                                    f.write(f",{self.realtime_data[ch][j][i]}")
-                                else:
-                                    f.write(",0")  # 缺失数据用0填充
-                            f.write("\n")
-
-                    self.log_message(f"通道 {ch + 1} 数据已保存至: {file_path}")
+            frames = self._realtime_frames()
+            if self._rt_head > self.REALTIME_MAX_FRAMES:
+                self.log_message(
+                    f"注意: 共采集{self._rt_head}组数据，仅保存最近的{self.REALTIME_MAX_FRAMES}组")
+
+            # 保存用户选择的通道
+            header = "波长(nm)" + "".join(f",{ts}" for ts in self.realtime_timestamps)
+            for ch in self._selected_channels():
+                # 创建通道文件名
+                filename = f"channel_{ch + 1}_{timestamp}.csv"
+                file_path = os.path.join(folder_path, filename)
+
+                # 按波长点组织: 每列一个时间点
+                data = frames[ch].T
+                table = np.column_stack((self.realtime_wavelengths, data))
+
+                # 写入数据
+                with open(file_path, 'w', encoding='utf-8-sig') as f:
+                    np.savetxt(f, table, fmt=['%.4f'] + ['%d'] * data.shape[1],
+                               delimiter=',', header=header, comments='')
+
+                self.log_message(f"通道 {ch + 1} 数据已保存至: {file_path}")
 
             self.log_message("所有通道数据保存完成")
 
@@ -684,9 +746,17 @@ class GM8050ControlApp(GM8050ControlAppUI):
         except Exception as e:
             self.log_message(f"保存实时数据失败: {str(e)}")
 
+    def _realtime_frames(self):
+        """按时间顺序返回环形缓冲区中的实时数据 (4, 帧数, 波长点数)"""
+        cap = self.REALTIME_MAX_FRAMES
+        if self._rt_head <= cap:
+            return self._rt_buf[:, :self._rt_head]
+        return np.roll(self._rt_buf, -(self._rt_head % cap), axis=1)
+
     def closeEvent(self, event):
         """窗口关闭时确保断开连接"""
         if self.reader:
             self.disconnect_device()
+        super().closeEvent(event)
         event.accept()
 
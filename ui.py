@@ -1,16 +1,102 @@
 import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTextEdit, QLabel, QLineEdit, QGroupBox, QGridLayout,
+    QPushButton, QPlainTextEdit, QLabel, QLineEdit, QGroupBox, QGridLayout,
     QComboBox, QCheckBox, QFileDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QLocale, pyqtSignal
+from PyQt5.QtGui import QValidator, QIntValidator, QDoubleValidator
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 import matplotlib.font_manager as fm
+import numpy as np
+
+# 中文字体，模块加载时查找一次并共享
+_CN_FONT_PATH = fm.findfont(fm.FontProperties(family='SimHei'))
+_CN_FONT = fm.FontProperties(fname=_CN_FONT_PATH)
+
+# 界面控件表：(属性名, 控件类, 构造参数...)，属性名为None的控件不保留引用，None项为弹性空白
+# 串口设置为网格布局，表项为(属性名, 控件类, 行, 列, 构造参数...)
+_COM_WIDGETS = [
+    (None, QLabel, 0, 0, "串口号:"),
+    ('port_combo', QComboBox, 0, 1),
+    ('refresh_btn', QPushButton, 0, 2, "刷新串口"),
+    (None, QLabel, 1, 0, "波特率:"),
+    ('baudrate_edit', QLineEdit, 1, 1, "115200"),
+    ('connect_btn', QPushButton, 0, 3, "连接设备"),
+    ('disconnect_btn', QPushButton, 1, 3, "断开连接"),
+]
+
+_LASER_WIDGETS = [
+    ('laser_on_btn', QPushButton, "开启激光"),
+    ('laser_off_btn', QPushButton, "关闭激光"),
+    None,
+    ('laser_status_label', QLabel, "状态: 未知"),
+]
+
+# 解调控制按行排列
+_DEMOD_ROWS = [
+    [
+        ('start_demod_btn', QPushButton, "启动解调"),
+        ('stop_demod_btn', QPushButton, "停止解调"),
+    ],
+    [
+        ('read_spectrum_btn', QPushButton, "读取光谱数据"),
+        ('save_data_btn', QPushButton, "保存光谱数据"),
+        ('start_realtime_btn', QPushButton, "开始实时绘图"),
+        ('stop_realtime_btn', QPushButton, "停止实时绘图"),
+        ('save_realtime_btn', QPushButton, "保存实时数据"),
+    ],
+    [
+        ('interval_label', QLabel, "更新时间间隔(秒):"),
+        ('interval_edit', QLineEdit, "1.0"),
+        None,
+        ('save_realtime_check', QCheckBox, "自动保存实时数据"),
+    ],
+]
+
+_SPECTRUM_WIDGETS = [
+    (None, QLabel, "起始波长(nm):"),
+    ('start_wl_edit', QLineEdit, "1527.0"),
+    (None, QLabel, "终止波长(nm):"),
+    ('stop_wl_edit', QLineEdit, "1568.0"),
+    (None, QLabel, "步长(nm):"),
+    ('step_edit', QLineEdit, "0.02"),
+]
+
+_CHANNEL_WIDGETS = [
+    ('ch1_check', QCheckBox, "通道 1"),
+    ('ch2_check', QCheckBox, "通道 2"),
+    ('ch3_check', QCheckBox, "通道 3"),
+    ('ch4_check', QCheckBox, "通道 4"),
+    None,
+]
+
+# 光谱幅值为16位无符号整数，纵轴固定为仪器量程
+_SPECTRUM_YLIM = (0, 65535)
+
+
+class _FallbackValidator(QValidator):
+    """包装数值校验器，输入不完整或超出范围时恢复为回退值"""
+
+    def __init__(self, validator, fallback, parent=None):
+        super().__init__(parent)
+        self._validator = validator
+        self._fallback = fallback
+
+    def validate(self, text, pos):
+        return self._validator.validate(text, pos)
+
+    def fixup(self, text):
+        # 输入框失去焦点或按回车时调用，恢复后的文本可被接受，仍会触发editingFinished
+        return self._fallback()
 
 
 class GM8050ControlAppUI(QMainWindow):
+    # 通道选择变化，同一事件循环内的多次切换合并为一次
+    channelMaskChanged = pyqtSignal(np.ndarray)
+
     def __init__(self):
         super().__init__()
         self.initUI()
@@ -28,37 +114,17 @@ class GM8050ControlAppUI(QMainWindow):
         # 串口控制区域
         com_group = QGroupBox("串口设置")
         com_layout = QGridLayout()
-
-        self.port_combo = QComboBox()
-        self.refresh_btn = QPushButton("刷新串口")
-        self.baudrate_edit = QLineEdit("115200")
-        self.connect_btn = QPushButton("连接设备")
-        self.disconnect_btn = QPushButton("断开连接")
+        self._add_grid_widgets(com_layout, _COM_WIDGETS)
+        self._bind_numeric(self.baudrate_edit, '_baudrate', int, QIntValidator(300, 4000000, self))
         self.disconnect_btn.setEnabled(False)
 
-        com_layout.addWidget(QLabel("串口号:"), 0, 0)
-        com_layout.addWidget(self.port_combo, 0, 1)
-        com_layout.addWidget(self.refresh_btn, 0, 2)
-        com_layout.addWidget(QLabel("波特率:"), 1, 0)
-        com_layout.addWidget(self.baudrate_edit, 1, 1)
-        com_layout.addWidget(self.connect_btn, 0, 3)
-        com_layout.addWidget(self.disconnect_btn, 1, 3)
-
         com_group.setLayout(com_layout)
         main_layout.addWidget(com_group)
 
         # 激光控制区域
         laser_group = QGroupBox("激光控制")
         laser_layout = QHBoxLayout()
-
-        self.laser_on_btn = QPushButton("开启激光")
-        self.laser_off_btn = QPushButton("关闭激光")
-        self.laser_status_label = QLabel("状态: 未知")
-
-        laser_layout.addWidget(self.laser_on_btn)
-        laser_layout.addWidget(self.laser_off_btn)
-        laser_layout.addStretch()
-        laser_layout.addWidget(self.laser_status_label)
+        self._add_widgets(laser_layout, _LASER_WIDGETS)
 
         laser_group.setLayout(laser_layout)
         main_layout.addWidget(laser_group)
@@ -66,60 +132,29 @@ class GM8050ControlAppUI(QMainWindow):
         # 解调控制区域
         demod_group = QGroupBox("解调控制")
         demod_layout = QVBoxLayout()
-
-        row1_layout = QHBoxLayout()
-        self.start_demod_btn = QPushButton("启动解调")
-        self.stop_demod_btn = QPushButton("停止解调")
-        self.read_spectrum_btn = QPushButton("读取光谱数据")
-        self.save_data_btn = QPushButton("保存光谱数据")
-
-
-        # 新增实时绘图按钮
-        row2_layout = QHBoxLayout()
-        self.start_realtime_btn = QPushButton("开始实时绘图")
-        self.stop_realtime_btn = QPushButton("停止实时绘图")
-        self.save_realtime_btn = QPushButton("保存实时数据")
+        for row in _DEMOD_ROWS:
+            row_layout = QHBoxLayout()
+            self._add_widgets(row_layout, row)
+            demod_layout.addLayout(row_layout)
         self.stop_realtime_btn.setEnabled(False)
         self.save_realtime_btn.setEnabled(False)
-
-        row3_layout = QHBoxLayout()
-        self.interval_label = QLabel("更新时间间隔(秒):")
-        self.interval_edit = QLineEdit("1.0")
         self.interval_edit.setFixedWidth(50)
-        self.save_realtime_check = QCheckBox("自动保存实时数据")
-
-        row1_layout.addWidget(self.start_demod_btn)
-        row1_layout.addWidget(self.stop_demod_btn)
-        row2_layout.addWidget(self.read_spectrum_btn)
-        row2_layout.addWidget(self.save_data_btn)
-        row2_layout.addWidget(self.start_realtime_btn)
-        row2_layout.addWidget(self.stop_realtime_btn)
-        row2_layout.addWidget(self.save_realtime_btn)
-        row3_layout.addWidget(self.interval_label)
-        row3_layout.addWidget(self.interval_edit)
-        row3_layout.addStretch()
-        row3_layout.addWidget(self.save_realtime_check)
-
-        demod_layout.addLayout(row1_layout)
-        demod_layout.addLayout(row2_layout)
-        demod_layout.addLayout(row3_layout)
+        self._bind_numeric(self.interval_edit, '_interval', float, QDoubleValidator(1.0, 3600.0, 2, self))
+
         demod_group.setLayout(demod_layout)
         main_layout.addWidget(demod_group)
 
         # 光谱参数设置
         spectrum_group = QGroupBox("光谱扫描参数")
         spectrum_layout = QHBoxLayout()
+        self._add_widgets(spectrum_layout, _SPECTRUM_WIDGETS)
+        self._bind_numeric(self.start_wl_edit, '_start_wl', float, QDoubleValidator(0.0, 10000.0, 3, self))
+        self._bind_numeric(self.stop_wl_edit, '_stop_wl', float, QDoubleValidator(0.0, 10000.0, 3, self))
+        self._bind_numeric(self.step_edit, '_step', float, QDoubleValidator(0.0001, 100.0, 4, self))
 
-        self.start_wl_edit = QLineEdit("1527.0")
-        self.stop_wl_edit = QLineEdit("1568.0")
-        self.step_edit = QLineEdit("0.02")
-
-        spectrum_layout.addWidget(QLabel("起始波长(nm):"))
-        spectrum_layout.addWidget(self.start_wl_edit)
-        spectrum_layout.addWidget(QLabel("终止波长(nm):"))
-        spectrum_layout.addWidget(self.stop_wl_edit)
-        spectrum_layout.addWidget(QLabel("步长(nm):"))
-        spectrum_layout.addWidget(self.step_edit)
+        # 波长范围修改后同步横轴范围
+        self.start_wl_edit.editingFinished.connect(self._update_xlim)
+        self.stop_wl_edit.editingFinished.connect(self._update_xlim)
 
         spectrum_group.setLayout(spectrum_layout)
         main_layout.addWidget(spectrum_group)
@@ -127,23 +162,19 @@ class GM8050ControlAppUI(QMainWindow):
         # 通道选择区域
         channel_group = QGroupBox("通道选择")
         channel_layout = QHBoxLayout()
-
-        self.ch1_check = QCheckBox("通道 1")
-        self.ch2_check = QCheckBox("通道 2")
-        self.ch3_check = QCheckBox("通道 3")
-        self.ch4_check = QCheckBox("通道 4")
+        self._add_widgets(channel_layout, _CHANNEL_WIDGETS)
 
         # 默认全选
-        self.ch1_check.setChecked(True)
-        self.ch2_check.setChecked(True)
-        self.ch3_check.setChecked(True)
-        self.ch4_check.setChecked(True)
+        self._channel_checks = (self.ch1_check, self.ch2_check, self.ch3_check, self.ch4_check)
+        for cb in self._channel_checks:
+            cb.setChecked(True)
 
-        channel_layout.addWidget(self.ch1_check)
-        channel_layout.addWidget(self.ch2_check)
-        channel_layout.addWidget(self.ch3_check)
-        channel_layout.addWidget(self.ch4_check)
-        channel_layout.addStretch()
+        # 通道选择掩码，复选框切换后更新，绘图时不再逐个查询复选框
+        self.ch_mask = np.array([cb.isChecked() for cb in self._channel_checks], dtype=bool)
+        self._mask_emit_pending = False
+        for cb in self._channel_checks:
+            cb.toggled.connect(self._schedule_mask_emit)
+        self.channelMaskChanged.connect(self._on_channel_mask_changed)
 
         channel_group.setLayout(channel_layout)
         main_layout.addWidget(channel_group)
@@ -152,24 +183,12 @@ class GM8050ControlAppUI(QMainWindow):
         plot_group = QGroupBox("数据可视化")
         plot_layout = QVBoxLayout()
 
-        # 创建图形和画布
-        self.fig = Figure(figsize=(10, 8))
-        self.canvas = FigureCanvas(self.fig)
-
-        # 设置中文字体
-        font_path = fm.findfont(fm.FontProperties(family='SimHei'))
-        self.fig.suptitle('光谱数据', fontproperties=fm.FontProperties(fname=font_path))
-
-        self.ax = self.fig.add_subplot(111)
-        self.ax.set_xlabel('波长 (nm)', fontproperties=fm.FontProperties(fname=font_path))
-        self.ax.set_ylabel('幅值', fontproperties=fm.FontProperties(fname=font_path))
-        self.ax.grid(True)
-
-        # 添加图例
-        self.ax.legend(['通道 1', '通道 2', '通道 3', '通道 4'],
-                       prop=fm.FontProperties(fname=font_path))
-
-        plot_layout.addWidget(self.canvas)
+        # 图形和画布在窗口显示后再创建，占位控件先占据绘图区域
+        self._plot_ready = False
+        self._plot_layout = plot_layout
+        self._plot_placeholder = QWidget()
+        plot_layout.addWidget(self._plot_placeholder)
+        QTimer.singleShot(0, self._build_plot)
 
         plot_group.setLayout(plot_layout)
         main_layout.addWidget(plot_group, 4)  # 分配更多空间给绘图区域
@@ -178,8 +197,9 @@ class GM8050ControlAppUI(QMainWindow):
         data_group = QGroupBox("数据输出")
         data_layout = QVBoxLayout()
 
-        self.output_text = QTextEdit()
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
+        self.output_text.setMaximumBlockCount(2000)  # 限制日志行数
         self.clear_btn = QPushButton("清空输出")
 
         data_layout.addWidget(self.output_text)
@@ -189,4 +209,224 @@ class GM8050ControlAppUI(QMainWindow):
         main_layout.addWidget(data_group, 1)  # 分配较少空间给输出区域
 
         # 状态栏
-        self.statusBar().showMessage("就绪")
\ No newline at end of file
+        self.statusBar().showMessage("就绪")
+
+    def _build_plot(self):
+        """创建图形、画布和曲线，替换占位控件；已创建时返回False"""
+        if self._plot_ready:
+            return False
+        self._plot_ready = True
+
+        # 创建图形和画布，DPI与屏幕一致；不使用tight/constrained布局，避免每次重绘重新计算布局
+        self.fig = Figure(figsize=(8, 5), dpi=self.logicalDpiX())
+        self.canvas = FigureCanvas(self.fig)
+
+        # 设置中文字体
+        self.fig.suptitle('光谱数据', fontproperties=_CN_FONT)
+
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_title('光谱扫描结果', fontproperties=_CN_FONT)
+        self.ax.set_xlabel('波长 (nm)', fontproperties=_CN_FONT)
+        self.ax.set_ylabel('幅值', fontproperties=_CN_FONT)
+        self.ax.grid(True)
+
+        # 固定坐标轴范围，刷新曲线时不再重新计算数据范围
+        self.ax.set_autoscale_on(False)
+        self.ax.set_ylim(*_SPECTRUM_YLIM)
+        self.ax.set_xlim(*(self._wavelength_range() or (1527.0, 1568.0)))
+
+        # 初始曲线数据（默认波长范围和步长，幅值为0）
+        n = int(round((1568.0 - 1527.0) / 0.02)) + 1
+        self._x = np.linspace(1527.0, 1568.0, n)
+        self._y = np.zeros((4, n), dtype=np.float32)
+
+        # 预先创建四个通道的曲线，刷新时只更新数据
+        self.lines = [self.ax.plot(self._x, self._y[i], color, label=label)[0]
+                      for i, (color, label) in enumerate(zip(['b', 'g', 'r', 'c'],
+                                                             ['通道 1', '通道 2', '通道 3', '通道 4']))]
+
+        # 添加图例，仅在可见通道变化时重建
+        self.ax.legend(handles=self.lines, prop=_CN_FONT, loc='upper right').set_animated(True)
+        self._legend_channels = tuple(range(len(self.lines)))
+
+        # 曲线为动态元素，完整重绘时不画入背景；收到数据前不显示
+        for line in self.lines:
+            line.set_animated(True)
+            line.set_visible(False)
+
+        # 透明前景层，与数据层重叠并共享坐标，放置光标等标注
+        self.ax_overlay = self.fig.add_axes(self.ax.get_position(), sharex=self.ax, sharey=self.ax,
+                                            facecolor='none')
+        self.ax_overlay.set_axis_off()
+        self.cursor_line = Line2D([0, 0], [0, 1], color='gray', linestyle='--', linewidth=0.8,
+                                  transform=self.ax_overlay.get_xaxis_transform(), animated=True)
+        self.ax_overlay.add_artist(self.cursor_line)
+        self.cursor_line.set_visible(False)
+
+        # 缓存的坐标轴背景（不含曲线）和数据层（含曲线），用于blit局部重绘，画布尺寸变化后失效
+        self._has_data = False
+        self._bg = None
+        self._bg_key = None
+        self._data_bg = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event', self._invalidate_background)
+        self.canvas.mpl_connect('axes_leave_event', self._on_axes_leave)
+
+        self._plot_layout.replaceWidget(self._plot_placeholder, self.canvas)
+        self._plot_placeholder.deleteLater()
+        self._plot_placeholder = None
+        return True
+
+    def request_redraw(self):
+        """外部刷新画布的统一入口，由Qt合并为一次空闲重绘"""
+        self._build_plot()
+        self.canvas.draw_idle()
+
+    def update_lines(self, xs, ys_list, channels):
+        """更新指定通道的曲线数据并局部重绘，其余通道隐藏"""
+        self._build_plot()
+
+        # 保留最新数据的引用，切换通道或调整横轴时据此重绘；set_data会自行复制数据
+        self._x = np.asarray(xs, dtype=np.float64)
+        self._y = ys_list
+        self._has_data = self._x.size > 0
+        channels = [ch for ch in channels if ch < len(ys_list)]
+        for ch in channels:
+            self.lines[ch].set_data(self._x, self._y[ch])
+        for i, line in enumerate(self.lines):
+            line.set_visible(i in channels)
+        visible = [self.lines[ch] for ch in channels]
+
+        # 可见通道变化时重建图例
+        if tuple(channels) != self._legend_channels:
+            self.ax.legend(handles=visible, prop=_CN_FONT, loc='upper right').set_animated(True)
+            self._legend_channels = tuple(channels)
+
+        # 坐标轴范围变化时同步完整重绘，由draw_event回调缓存背景并绘制曲线
+        if self._bg is None or self._bg_key != self._background_key():
+            self.canvas.draw()
+            return
+
+        # 否则恢复背景后只重绘动态元素
+        self.canvas.restore_region(self._bg)
+        self._draw_dynamic()
+        self.canvas.blit(self.ax.bbox)
+
+    def _background_key(self):
+        """背景缓存对应的坐标轴范围（曲线和图例均为动态元素，不影响背景）"""
+        return (self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _draw_dynamic(self):
+        """绘制可见曲线和图例，缓存数据层后绘制光标"""
+        for line in self.lines:
+            if line.get_visible():
+                self.ax.draw_artist(line)
+        self.ax.draw_artist(self.ax.get_legend())
+
+        # 缓存数据层，光标移动时只重绘前景层
+        self._data_bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.cursor_line.get_visible():
+            self.ax_overlay.draw_artist(self.cursor_line)
+
+    def _on_draw(self, event):
+        """完整重绘后缓存不含动态元素的背景，再补画动态元素"""
+        if not self.lines:
+            return
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._bg_key = self._background_key()
+        self._draw_dynamic()
+
+    def update_cursor(self, x):
+        """在前景层的指定波长处显示光标，x为None时隐藏"""
+        if self._data_bg is None:
+            return
+        self.canvas.restore_region(self._data_bg)
+        if x is None:
+            self.cursor_line.set_visible(False)
+        else:
+            self.cursor_line.set_xdata([x, x])
+            self.cursor_line.set_visible(True)
+            self.ax_overlay.draw_artist(self.cursor_line)
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_axes_leave(self, event):
+        """鼠标离开绘图区时隐藏光标"""
+        self.update_cursor(None)
+
+    def _add_widgets(self, layout, table):
+        """按控件表创建控件并依次加入布局"""
+        for entry in table:
+            if entry is None:
+                layout.addStretch()
+                continue
+            name, cls, *args = entry
+            widget = cls(*args)
+            if name:
+                setattr(self, name, widget)
+            layout.addWidget(widget)
+
+    def _add_grid_widgets(self, layout, table):
+        """按控件表创建控件并放入网格布局的指定位置"""
+        for name, cls, row, col, *args in table:
+            widget = cls(*args)
+            if name:
+                setattr(self, name, widget)
+            layout.addWidget(widget, row, col)
+
+    def _bind_numeric(self, edit, attr, convert, validator):
+        """为数值输入框设置校验器，输入完成时将数值缓存到attr，无效输入恢复为缓存值"""
+        locale = QLocale.c()
+        locale.setNumberOptions(QLocale.RejectGroupSeparator)
+        validator.setLocale(locale)
+        edit.setValidator(_FallbackValidator(validator, lambda: str(getattr(self, attr)), self))
+        setattr(self, attr, convert(edit.text()))
+        edit.editingFinished.connect(lambda: setattr(self, attr, convert(edit.text())))
+
+    def _wavelength_range(self):
+        """返回缓存的起止波长，范围无效时返回None"""
+        return (self._start_wl, self._stop_wl) if self._start_wl < self._stop_wl else None
+
+    def _update_xlim(self):
+        """按起止波长设置横轴范围，并使缓存的背景失效"""
+        wl_range = self._wavelength_range()
+        if not self._plot_ready or wl_range is None:
+            return
+        self.ax.set_xlim(*wl_range)
+        self._invalidate_background()
+        if self._has_data:
+            self.update_lines(self._x, self._y, list(self._legend_channels))
+        else:
+            self.request_redraw()
+
+    def _schedule_mask_emit(self):
+        """复选框切换后在下一轮事件循环统一发出通道变化信号"""
+        if not self._mask_emit_pending:
+            self._mask_emit_pending = True
+            QTimer.singleShot(0, self._emit_mask)
+
+    def _emit_mask(self):
+        """读取复选框状态，通道选择有变化时发出一次信号"""
+        self._mask_emit_pending = False
+        mask = np.array([cb.isChecked() for cb in self._channel_checks], dtype=bool)
+        if not np.array_equal(mask, self.ch_mask):
+            self.channelMaskChanged.emit(mask)
+
+    def _on_channel_mask_changed(self, mask):
+        """更新通道掩码，并用已有数据刷新曲线"""
+        self.ch_mask = mask
+        if self._plot_ready and self._has_data:
+            self.update_lines(self._x, self._y, np.flatnonzero(self.ch_mask).tolist())
+
+    def closeEvent(self, event):
+        """窗口关闭时释放图形及曲线引用"""
+        if self._plot_ready:
+            self.fig.clf()
+            self.lines = []
+            self._bg = None
+            self._data_bg = None
+        super().closeEvent(event)
+
+    def _invalidate_background(self, event=None):
+        """画布尺寸变化后缓存的背景失效"""
+        self._bg = None
+        self._data_bg = None